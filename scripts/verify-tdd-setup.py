@@ -5,27 +5,315 @@ TDD Setup Verification Script
 This script verifies that the TDD environment is correctly configured
 and all necessary components are working.
 """
+import argparse
+import functools
+import hashlib
+import importlib.util
+import io
+import json
 import sys
 import os
+import shutil
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+# Resolve the project root once and keep every derived path as a plain
+# string; building fresh PurePath objects per check is avoidable
+# allocation in the hot path.
+PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+SRC_PATH = os.path.join(PROJECT_ROOT, "src")
+PACKAGE_JSON = os.path.join(PROJECT_ROOT, "package.json")
+
 # Add src to Python path
-project_root = Path(__file__).parent.parent
-src_path = project_root / "src"
-sys.path.insert(0, str(src_path))
+sys.path.insert(0, SRC_PATH)
+
+# Interpreter facts are constants for the life of the process; compute
+# them once instead of re-deriving them on every test invocation.
+PY_OK = sys.version_info >= (3, 11)
+IN_VENV = sys.prefix != getattr(sys, "base_prefix", sys.prefix)
+
+# Parsed CLI options; populated by main() before any test runs
+options = argparse.Namespace(
+    deep=False, fail_fast=False, force=False, json=False, only=None, show_versions=False
+)
+
+# Cached pass/fail results from previous runs, keyed by test name;
+# loaded from CACHE_FILE in main() and written back after the run
+CACHE_DIR = os.path.join(PROJECT_ROOT, ".cache")
+CACHE_FILE = os.path.join(CACHE_DIR, "verify-tdd.json")
+_result_cache = {}
+_result_cache_lock = threading.Lock()
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Verify the TDD environment setup")
+    parser.add_argument(
+        "--deep",
+        action="store_true",
+        help="run full pytest/Jest test discovery instead of cheap existence probes",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="stop scheduling further checks after the first failure",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="re-run all checks, ignoring cached results from previous runs",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="emit one JSON document instead of colored per-line output (for CI)",
+    )
+    parser.add_argument(
+        "--show-versions",
+        action="store_true",
+        help="spawn the external tools to report their versions instead of just checking presence",
+    )
+    parser.add_argument(
+        "--only",
+        metavar="CHECKS",
+        help="comma-separated subset of checks to run (e.g. --only=db,python)",
+    )
+    args = parser.parse_args(argv)
+    if args.only is not None:
+        names = [name.strip() for name in args.only.split(",") if name.strip()]
+        if not names:
+            parser.error(f"--only requires at least one check (choose from {', '.join(TESTS)})")
+        unknown = [name for name in names if name not in TESTS]
+        if unknown:
+            parser.error(
+                f"unknown checks: {', '.join(unknown)} (choose from {', '.join(TESTS)})"
+            )
+        args.only = names
+    return args
+
+# Per-thread output buffer so concurrently running tests don't interleave
+# their status lines; main() flushes buffers in submission order.
+_thread_output = threading.local()
+
+# Single buffered writer for all status output. Each print() on
+# line-buffered stdout costs a write syscall per line, and concurrent
+# tests serialize on the stdout lock; buffering here and flushing only
+# at test boundaries avoids both.
+_OUT = io.TextIOWrapper(sys.stdout.buffer, line_buffering=False, write_through=False)
+
+_COLORS = {
+    "INFO": "\033[0;34m",    # Blue
+    "SUCCESS": "\033[0;32m", # Green
+    "WARNING": "\033[1;33m", # Yellow
+    "ERROR": "\033[0;31m",   # Red
+}
+_RESET = "\033[0m"
+# Precomputed per-status format strings; skip the escape codes entirely
+# when stdout isn't a terminal so they don't end up in piped logs
+_USE_COLOR = sys.stdout.isatty()
+_FMT = {
+    status: f"{color}{{}}{_RESET}" if _USE_COLOR else "{}"
+    for status, color in _COLORS.items()
+}
+
+class TextReporter:
+    """Human-oriented reporter: colored status lines, streamed per check"""
+
+    def log(self, message, status="INFO"):
+        line = _FMT.get(status, "{}").format(message)
+        buffer = getattr(_thread_output, "buffer", None)
+        if buffer is not None:
+            buffer.write(line + "\n")
+        else:
+            _OUT.write(line + "\n")
+
+    def record(self, name, status, duration_ms, buffer):
+        # The check's lines were already rendered into its buffer;
+        # replay them in submission order so logs stay readable
+        _OUT.write(buffer.getvalue())
+        _OUT.flush()
+
+    def finalize(self, all_passed):
+        print_summary(all_passed)
+        _OUT.flush()
+
+class JsonReporter:
+    """Machine-oriented reporter: a single JSON document at end of run
+
+    CI throws the colored output away or greps it; one json.dump is a
+    single write syscall and downstream parsing becomes a plain JSON
+    load instead of a regex over escape codes.
+    """
+
+    def __init__(self):
+        self.results = {}
+
+    def log(self, message, status="INFO"):
+        # Collect plain (uncolored) lines per check; the banner and
+        # summary chrome outside any check is dropped
+        buffer = getattr(_thread_output, "buffer", None)
+        if buffer is not None and message:
+            buffer.write(message + "\n")
+
+    def record(self, name, status, duration_ms, buffer):
+        self.results[name] = {
+            "status": status,
+            "duration_ms": round(duration_ms, 1),
+            "message": buffer.getvalue().strip(),
+        }
+
+    def finalize(self, all_passed):
+        json.dump(self.results, _OUT, indent=2)
+        _OUT.write("\n")
+        _OUT.flush()
+
+# Active reporter; swapped for a JsonReporter in main() under --json
+reporter = TextReporter()
 
 def print_status(message, status="INFO"):
-    """Print colored status messages"""
-    colors = {
-        "INFO": "\033[0;34m",    # Blue
-        "SUCCESS": "\033[0;32m", # Green
-        "WARNING": "\033[1;33m", # Yellow
-        "ERROR": "\033[0;31m",   # Red
+    """Log a status message through the active reporter"""
+    reporter.log(message, status)
+
+@functools.lru_cache(maxsize=1)
+def get_tool_versions():
+    """Probe node/pnpm/pre-commit versions in a single shell invocation
+
+    Each subprocess.Popen pays fork+exec overhead, so probing the tools
+    one by one costs several forks; batching them into one `bash -c` call
+    pays it once. Returns a dict mapping tool name to its version string,
+    or None when the tool is missing.
+    """
+    tools = ("node", "pnpm", "pre-commit")
+    delimiter = "---"
+    cmd = f"; echo {delimiter}; ".join(
+        f"{tool} --version 2>/dev/null || echo MISSING" for tool in tools
+    )
+    try:
+        result = subprocess.run(
+            ['bash', '-lc', f"set +e; {cmd}"], capture_output=True, text=True
+        )
+    except Exception:
+        return {tool: None for tool in tools}
+
+    versions = {}
+    sections = result.stdout.split(f"{delimiter}\n")
+    for tool, section in zip(tools, sections):
+        version = section.strip()
+        versions[tool] = version if version and version != "MISSING" else None
+    return versions
+
+@functools.lru_cache(maxsize=1)
+def get_root_entries():
+    """Names of the top-level entries in the project root
+
+    One directory read replaces a stat syscall per path probed;
+    negligible on an SSD but noticeable on networked or Docker overlay
+    filesystems.
+    """
+    try:
+        return frozenset(entry.name for entry in os.scandir(PROJECT_ROOT))
+    except OSError:
+        return frozenset()
+
+def find_tool(tool):
+    """Locate an external tool without forking it
+
+    Spawning `node --version` boots a whole JS VM just to print a string;
+    for a presence check, shutil.which (a few stat calls) is three orders
+    of magnitude cheaper. Returns the version string under
+    --show-versions (one batched spawn for all tools), otherwise the
+    resolved path, or None when the tool is missing.
+    """
+    if options.show_versions:
+        return get_tool_versions()[tool]
+    return shutil.which(tool)
+
+def hash_file(path):
+    """Return a short content hash of a file, or None if it's unreadable"""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+    except OSError:
+        return None
+
+@functools.lru_cache(maxsize=1)
+def get_environment_fingerprint():
+    """Fingerprint of the inputs the verification results depend on
+
+    A cached pass is only reused while this fingerprint matches;
+    changing the interpreter, Node, the dependency manifests, or the
+    probe depth (--deep / --show-versions run different checks, so a
+    shallow pass must not satisfy a deep run) invalidates it.
+    """
+    # Identify the Node install by path + mtime rather than forking
+    # `node --version`
+    node_path = shutil.which("node")
+    node = f"{node_path}:{os.stat(node_path).st_mtime_ns}" if node_path else None
+    return {
+        "python": sys.version,
+        "node": node,
+        "package.json": hash_file(PACKAGE_JSON),
+        "requirements": hash_file(os.path.join(PROJECT_ROOT, "requirements-dev-frozen.txt")),
+        "deep": options.deep,
+        "show_versions": options.show_versions,
     }
-    reset = "\033[0m"
-    print(f"{colors.get(status, '')}{message}{reset}")
 
+def load_result_cache():
+    """Load cached results from a previous run, if any"""
+    try:
+        with open(CACHE_FILE, "rb") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_result_cache():
+    """Persist results so unchanged checks can be skipped next run"""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(CACHE_FILE, "w") as f:
+            json.dump(_result_cache, f, indent=2)
+    except OSError:
+        pass
+
+def cached_test(test):
+    """Reuse a test's previous pass while its inputs are unchanged
+
+    Developers re-run this script repeatedly after small fixes; redoing
+    every probe from scratch each time wastes seconds. Only passes are
+    cached: the fix for a failure (installing a tool, pip install,
+    pnpm install) usually doesn't touch any fingerprint input, so a
+    cached failure would keep reporting stale ❌ until the user
+    discovered --force. Pass --force to bypass the cache.
+    """
+    @functools.wraps(test)
+    def wrapper(*args, **kwargs):
+        name = test.__name__
+        fingerprint = get_environment_fingerprint()
+        entry = _result_cache.get(name)
+        if (
+            not options.force
+            and entry is not None
+            and entry.get("passed") is True
+            and entry.get("fingerprint") == fingerprint
+        ):
+            print_status(f"✅ {name} (cached; --force to re-run)", "SUCCESS")
+            return True
+        passed = test(*args, **kwargs)
+        with _result_cache_lock:
+            if passed:
+                _result_cache[name] = {
+                    "fingerprint": fingerprint,
+                    "passed": passed,
+                    "timestamp": time.time(),
+                }
+            else:
+                _result_cache.pop(name, None)
+        return passed
+    return wrapper
+
+@cached_test
 def test_python_environment():
     """Test Python environment setup"""
     print_status("Testing Python environment...", "INFO")
@@ -33,13 +321,13 @@ def test_python_environment():
     try:
         # Test Python version
         version = sys.version_info
-        if version.major == 3 and version.minor >= 11:
+        if PY_OK:
             print_status(f"✅ Python {version.major}.{version.minor}.{version.micro}", "SUCCESS")
         else:
             print_status(f"⚠️  Python {version.major}.{version.minor}.{version.micro} (3.11+ recommended)", "WARNING")
-        
+
         # Test virtual environment
-        if hasattr(sys, 'real_prefix') or (hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix):
+        if IN_VENV:
             print_status("✅ Virtual environment active", "SUCCESS")
         else:
             print_status("⚠️  No virtual environment detected", "WARNING")
@@ -65,6 +353,7 @@ def test_python_environment():
         print_status(f"❌ Python environment test failed: {e}", "ERROR")
         return False
 
+@cached_test
 def test_sentry_imports():
     """Test Sentry module imports"""
     print_status("Testing Sentry imports...", "INFO")
@@ -77,8 +366,13 @@ def test_sentry_imports():
         import sentry.utils.auth
         print_status("✅ sentry.utils.auth", "SUCCESS")
         
-        # Test fido2 fix
-        from fido2.ctap2 import AuthenticatorData
+        # Test fido2 fix. find_spec confirms the module resolves without
+        # executing it (a real import drags in the whole cryptography
+        # stack); --deep still imports the symbol itself.
+        if options.deep:
+            from fido2.ctap2 import AuthenticatorData  # noqa: F401
+        elif importlib.util.find_spec("fido2.ctap2") is None:
+            raise ImportError("No module named 'fido2.ctap2'")
         print_status("✅ fido2.ctap2.AuthenticatorData (compatibility fixed)", "SUCCESS")
         
         return True
@@ -91,29 +385,30 @@ def test_sentry_imports():
         print_status(f"❌ Sentry import test failed: {e}", "ERROR")
         return False
 
+@cached_test
 def test_javascript_environment():
     """Test JavaScript/Node.js environment"""
     print_status("Testing JavaScript environment...", "INFO")
     
     try:
         # Test Node.js
-        result = subprocess.run(['node', '--version'], capture_output=True, text=True)
-        if result.returncode == 0:
-            print_status(f"✅ Node.js {result.stdout.strip()}", "SUCCESS")
+        node = find_tool("node")
+        if node:
+            print_status(f"✅ Node.js {node}", "SUCCESS")
         else:
             print_status("❌ Node.js not found", "ERROR")
             return False
-        
+
         # Test pnpm
-        result = subprocess.run(['pnpm', '--version'], capture_output=True, text=True)
-        if result.returncode == 0:
-            print_status(f"✅ pnpm {result.stdout.strip()}", "SUCCESS")
+        pnpm = find_tool("pnpm")
+        if pnpm:
+            print_status(f"✅ pnpm {pnpm}", "SUCCESS")
         else:
             print_status("❌ pnpm not found", "ERROR")
             return False
         
         # Check if node_modules exists
-        if (project_root / "node_modules").exists():
+        if "node_modules" in get_root_entries():
             print_status("✅ Node.js dependencies installed", "SUCCESS")
         else:
             print_status("⚠️  Node.js dependencies not found", "WARNING")
@@ -125,54 +420,84 @@ def test_javascript_environment():
         print_status(f"❌ JavaScript environment test failed: {e}", "ERROR")
         return False
 
+# Deliberately not @cached_test: whether Redis/Postgres are listening
+# right now can't be captured by any file-based fingerprint, and the
+# live probe is cheap (1s timeouts, run concurrently).
 def test_database_connections():
     """Test database service connections"""
     print_status("Testing database connections...", "INFO")
     
-    # Test Redis
-    try:
+    def check_redis():
         import redis
-        r = redis.Redis(host='localhost', port=6379, decode_responses=True)
-        r.ping()
-        print_status("✅ Redis connection", "SUCCESS")
-    except Exception as e:
-        print_status(f"❌ Redis connection failed: {e}", "ERROR")
-        print_status("💡 Run: docker run --name sentry-redis-dev -p 6379:6379 -d redis:6-alpine", "INFO")
-        return False
-    
-    # Test PostgreSQL
-    try:
+        r = redis.Redis(
+            host='localhost',
+            port=6379,
+            decode_responses=True,
+            socket_connect_timeout=1,
+            socket_timeout=1,
+        )
+        try:
+            r.ping()
+        finally:
+            # Close explicitly instead of leaving the socket to the GC
+            r.close()
+
+    def check_postgres():
         import psycopg2
         conn = psycopg2.connect(
             host="localhost",
             database="sentry",
             user="sentry",
-            password="sentry"
+            password="sentry",
+            connect_timeout=1,
         )
         conn.close()
-        print_status("✅ PostgreSQL connection", "SUCCESS")
-    except Exception as e:
-        print_status(f"❌ PostgreSQL connection failed: {e}", "ERROR")
-        print_status("💡 Run: docker run --name sentry-postgres-dev -e POSTGRES_DB=sentry -e POSTGRES_USER=sentry -e POSTGRES_PASSWORD=sentry -p 5432:5432 -d postgres:13", "INFO")
-        return False
-    
-    return True
 
+    # Probe both services concurrently with 1s connect timeouts: a
+    # misconfigured environment fails in about a second instead of
+    # stalling on the library defaults, and on the happy path the two
+    # round trips overlap.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        redis_future = executor.submit(check_redis)
+        postgres_future = executor.submit(check_postgres)
+
+        passed = True
+        try:
+            redis_future.result()
+            print_status("✅ Redis connection", "SUCCESS")
+        except Exception as e:
+            print_status(f"❌ Redis connection failed: {e}", "ERROR")
+            print_status("💡 Run: docker run --name sentry-redis-dev -p 6379:6379 -d redis:6-alpine", "INFO")
+            passed = False
+
+        try:
+            postgres_future.result()
+            print_status("✅ PostgreSQL connection", "SUCCESS")
+        except Exception as e:
+            print_status(f"❌ PostgreSQL connection failed: {e}", "ERROR")
+            print_status("💡 Run: docker run --name sentry-postgres-dev -e POSTGRES_DB=sentry -e POSTGRES_USER=sentry -e POSTGRES_PASSWORD=sentry -p 5432:5432 -d postgres:13", "INFO")
+            passed = False
+
+    return passed
+
+@cached_test
 def test_code_quality_tools():
     """Test code quality tools"""
     print_status("Testing code quality tools...", "INFO")
     
     try:
         # Test pre-commit
-        result = subprocess.run(['pre-commit', '--version'], capture_output=True, text=True)
-        if result.returncode == 0:
-            print_status(f"✅ pre-commit {result.stdout.strip()}", "SUCCESS")
+        pre_commit = find_tool("pre-commit")
+        if pre_commit:
+            print_status(f"✅ pre-commit {pre_commit}", "SUCCESS")
         else:
             print_status("❌ pre-commit not found", "ERROR")
             return False
         
-        # Test ESLint
-        result = subprocess.run(['pnpm', 'run', 'lint:js', '--help'], capture_output=True, text=True)
+        # Test ESLint; only the exit code matters, so skip the pipe
+        # allocation and drain that capture_output would cost
+        result = subprocess.run(['pnpm', 'run', 'lint:js', '--help'],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         if result.returncode == 0:
             print_status("✅ ESLint configured", "SUCCESS")
         else:
@@ -184,33 +509,86 @@ def test_code_quality_tools():
         print_status(f"❌ Code quality tools test failed: {e}", "ERROR")
         return False
 
+@cached_test
 def test_quick_commands():
     """Test that key TDD commands work"""
     print_status("Testing TDD commands...", "INFO")
     
     try:
-        # Test pytest can find tests
-        result = subprocess.run(['python', '-m', 'pytest', '--collect-only', '-q'], 
-                              capture_output=True, text=True, cwd=project_root)
-        if result.returncode == 0:
-            print_status("✅ pytest test discovery", "SUCCESS")
-        else:
-            print_status("⚠️  pytest test discovery issues", "WARNING")
-        
-        # Test Jest can find tests
-        result = subprocess.run(['pnpm', 'test', '--listTests'], 
-                              capture_output=True, text=True, cwd=project_root)
-        if result.returncode == 0:
+        if options.deep:
+            # Full discovery: loads the entire test tree, can take many
+            # seconds. Only the exit codes are checked, so discard the
+            # output rather than paying for capture pipes.
+            result = subprocess.run(['python', '-m', 'pytest', '--collect-only', '-q'],
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                  cwd=PROJECT_ROOT)
+            if result.returncode == 0:
+                print_status("✅ pytest test discovery", "SUCCESS")
+            else:
+                print_status("⚠️  pytest test discovery issues", "WARNING")
+
+            result = subprocess.run(['pnpm', 'test', '--listTests'],
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                  cwd=PROJECT_ROOT)
+            if result.returncode == 0:
+                print_status("✅ Jest test discovery", "SUCCESS")
+            else:
+                print_status("⚠️  Jest test discovery issues", "WARNING")
+            return True
+
+        # Cheap probes: this script only verifies the toolchain is wired
+        # up, so confirm pytest imports and the test tree exists rather
+        # than collecting every test in the repo.
+        try:
+            import pytest  # noqa: F401
+            if "tests" in get_root_entries():
+                print_status("✅ pytest test discovery", "SUCCESS")
+            else:
+                print_status("⚠️  pytest test discovery issues (no tests/ directory)", "WARNING")
+        except ImportError:
+            print_status("⚠️  pytest test discovery issues (pytest not importable)", "WARNING")
+
+        # For Jest, a config (jest.config.* or a "jest" key in
+        # package.json) plus a test script is enough; even --listTests
+        # boots the Jest config, resolves presets, and walks the tree.
+        try:
+            with open(PACKAGE_JSON, "rb") as f:
+                pkg = json.load(f)
+            has_test_script = "test" in pkg.get("scripts", {})
+            has_jest_config = "jest" in pkg
+        except (OSError, ValueError):
+            has_test_script = has_jest_config = False
+        root_entries = get_root_entries()
+        has_jest_config = has_jest_config or any(
+            f"jest.config.{ext}" in root_entries for ext in ("js", "ts", "json", "mjs")
+        )
+        if has_jest_config and has_test_script:
             print_status("✅ Jest test discovery", "SUCCESS")
         else:
-            print_status("⚠️  Jest test discovery issues", "WARNING")
-        
+            print_status("⚠️  Jest test discovery issues (re-run with --deep to diagnose)", "WARNING")
+
         return True
-        
+
     except Exception as e:
         print_status(f"❌ TDD commands test failed: {e}", "ERROR")
         return False
 
+# Selector name -> (test function, dependencies), in execution order.
+# A check whose dependency failed can't pass either (e.g. a broken
+# Python env means Sentry imports will fail too), so it is skipped
+# rather than wasting time producing a redundant failure. Keeping heavy
+# imports (django, pytest, redis, psycopg2) inside the test bodies means
+# a targeted run (e.g. --only=db) never loads the packages the skipped
+# checks would need.
+TESTS = {
+    "python": (test_python_environment, ()),
+    "sentry": (test_sentry_imports, ("python",)),
+    "javascript": (test_javascript_environment, ()),
+    "db": (test_database_connections, ("sentry",)),
+    "quality": (test_code_quality_tools, ()),
+    "commands": (test_quick_commands, ()),
+}
+
 def print_summary(all_passed):
     """Print setup summary and next steps"""
     print_status("\n" + "="*50, "INFO")
@@ -244,33 +622,108 @@ def print_summary(all_passed):
         print_status("  3. Check that .venv is activated", "INFO")
         print_status("  4. Set PYTHONPATH: export PYTHONPATH=$PWD/src:$PYTHONPATH", "INFO")
 
+def run_test(test, buffer):
+    """Run a single test with its output captured into `buffer`
+
+    Returns a (passed, duration_ms) tuple.
+    """
+    _thread_output.buffer = buffer
+    start = time.monotonic()
+    try:
+        try:
+            result = test()
+        except Exception as e:
+            print_status(f"❌ Test {test.__name__} crashed: {e}", "ERROR")
+            result = False
+        print_status("")  # Add spacing between tests
+        return result, (time.monotonic() - start) * 1000
+    finally:
+        _thread_output.buffer = None
+
+def skip_test(name, failed_check, buffer):
+    """Record a test as skipped because a check it depends on failed
+
+    `failed_check` is the root failing check, not an intermediate
+    dependency that was itself only skipped, so the message points the
+    user at the problem to actually fix.
+    """
+    _thread_output.buffer = buffer
+    try:
+        print_status(f"⏭️  Skipped {name} check ({failed_check} check failed)", "WARNING")
+        print_status("")
+    finally:
+        _thread_output.buffer = None
+
 def main():
     """Main verification function"""
+    global options, reporter
+    options = parse_args()
+    if options.json:
+        reporter = JsonReporter()
+    _result_cache.update(load_result_cache())
+
     print_status("🔍 Sentry TDD Setup Verification", "INFO")
     print_status("="*40, "INFO")
-    
-    tests = [
-        test_python_environment,
-        test_sentry_imports,
-        test_javascript_environment,
-        test_database_connections,
-        test_code_quality_tools,
-        test_quick_commands,
+
+    selected = [
+        name for name in TESTS if options.only is None or name in options.only
     ]
-    
-    results = []
-    for test in tests:
-        try:
-            result = test()
-            results.append(result)
-            print_status("")  # Add spacing between tests
-        except Exception as e:
-            print_status(f"❌ Test {test.__name__} crashed: {e}", "ERROR")
-            results.append(False)
-    
-    all_passed = all(results)
-    print_summary(all_passed)
-    
+
+    # All checks are I/O-bound (subprocess spawns, socket connects), so
+    # run them concurrently in dependency-ordered waves: each wave
+    # submits every check whose (selected) dependencies have passed,
+    # skips checks whose dependency failed, and --fail-fast stops
+    # scheduling new waves after the first failure.
+    buffers = {name: io.StringIO() for name in selected}
+    results = {}
+    statuses = {}
+    durations = {}
+    # Maps a failed or skipped check to the root failing check behind it,
+    # so transitive skips blame the check the user actually has to fix
+    root_failure = {}
+    with ThreadPoolExecutor(max_workers=len(selected)) as executor:
+        pending = selected
+        while pending:
+            ready = []
+            blocked = []
+            for name in pending:
+                deps = [dep for dep in TESTS[name][1] if dep in selected]
+                failed_deps = [dep for dep in deps if results.get(dep) is False]
+                if failed_deps:
+                    root = root_failure.get(failed_deps[0], failed_deps[0])
+                    skip_test(name, root, buffers[name])
+                    results[name] = False
+                    statuses[name] = "skipped"
+                    root_failure[name] = root
+                elif all(dep in results for dep in deps):
+                    ready.append(name)
+                else:
+                    blocked.append(name)
+            if not ready:
+                break
+            futures = {
+                executor.submit(run_test, TESTS[name][0], buffers[name]): name
+                for name in ready
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                passed, duration_ms = future.result()
+                results[name] = passed
+                statuses[name] = "passed" if passed else "failed"
+                durations[name] = duration_ms
+            if options.fail_fast and not all(results.values()):
+                break
+            pending = blocked
+
+    # Report results in submission order so logs stay readable
+    for name in selected:
+        if name in statuses:
+            reporter.record(name, statuses[name], durations.get(name, 0.0), buffers[name])
+
+    all_passed = all(results.values())
+    save_result_cache()
+    reporter.finalize(all_passed)
+
     return 0 if all_passed else 1
 
 if __name__ == "__main__":